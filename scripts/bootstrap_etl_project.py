@@ -0,0 +1,62 @@
+"""Scaffold the ETL project layout (used when spinning up a new pipeline repo)."""
+
+import os
+from collections import deque
+from pathlib import Path
+
+base_structure = {
+    "config": {
+        "datasets.yaml": "datasets: []\n",
+    },
+    "src": {
+        "extract": {
+            "__init__.py": "",
+            "base.py": "# extractor base classes and fetch helpers\n",
+        },
+        "transform": {
+            "__init__.py": "",
+            "cloudflare.py": "# dataset processors\n",
+        },
+        "load": {
+            "__init__.py": "",
+            "csv_loader.py": "# dataset writers\n",
+        },
+        "utils": {
+            "__init__.py": "",
+            "logger.py": "# shared logging setup\n",
+        },
+    },
+    "data": {},
+    "scripts": {
+        "run_pipeline.py": "# pipeline entry point\n",
+    },
+}
+
+
+def create_structure(root: str, structure: dict = base_structure) -> None:
+    """Materialize the project tree under root.
+
+    Walks the structure iteratively with a stack instead of recursing, collects
+    every file first, then issues one makedirs per unique parent directory and
+    one write per file.
+    """
+    files = []
+    dirs = set()
+    stack = deque([(root, structure)])
+    while stack:
+        base, node = stack.pop()
+        dirs.add(base)
+        for name, content in node.items():
+            path = os.path.join(base, name)
+            if isinstance(content, dict):
+                stack.append((path, content))
+            else:
+                files.append((path, content))
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+    for path, content in files:
+        Path(path).write_text(content, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    create_structure(os.getcwd())
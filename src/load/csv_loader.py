@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+
+def save(df: pd.DataFrame, name: str, output_dir: str = "data", format: str = "csv") -> None:
+    """Save a DataFrame as <output_dir>/<name>.<format> ("csv" or "parquet").
+
+    Callers are expected to have created output_dir up front (main() does this
+    once per run), so save stays syscall-free apart from the write itself.
+
+    Parquet keeps dtypes, dictionary-encodes the repeated country columns and
+    compresses to a fraction of the CSV size; CSV stays the default for
+    downstream consumers that expect it.
+    """
+    # Single os.path.join instead of per-format f-string interpolation; the
+    # Arrow writers require str paths, so the path stays unencoded.
+    out = os.path.join(output_dir, f"{name}.{format}")
+    if format == "parquet":
+        df.to_parquet(out, engine="pyarrow", compression="snappy", index=False)
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pacsv.write_csv(table, out, write_options=pacsv.WriteOptions(include_header=True))
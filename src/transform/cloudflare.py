@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+from src.extract.base import RadarResult
+
+
+def process_top_locations(result: RadarResult, value_key: str) -> pd.DataFrame:
+    """Process a decoded Radar top-locations result into a country-level DataFrame."""
+    main = result.main
+    codes = [loc.clientCountryAlpha2 for loc in main]
+    names = [loc.clientCountryName for loc in main]
+    # np.fromiter with a known count materializes the float64 column in a
+    # single C-level pass instead of list-then-convert.
+    values = np.fromiter((loc.value for loc in main), dtype=np.float64, count=len(main))
+    df = pd.DataFrame({"country_code": codes, "country_name": names, value_key: values}, copy=False)
+    # Country codes/names repeat heavily across datasets: categorical columns store one
+    # int8 code per row instead of a Python string object, and the value column is
+    # already float64 from the typed decode.
+    return df.astype({"country_code": "category", "country_name": "category"})
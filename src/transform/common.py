@@ -0,0 +1,24 @@
+"""Shared country-code lookup tables and conversions.
+
+pycountry's .get/.lookup accessors scan linearly per call, so every table is
+built exactly once at import and reused as a plain dict; processors join
+against them with Series.map instead of per-row lookups.
+"""
+
+import pandas as pd
+import pycountry
+
+NAME_BY_ALPHA3 = {c.alpha_3: c.name for c in pycountry.countries}
+ALPHA3_FROM_ALPHA2 = {c.alpha_2: c.alpha_3 for c in pycountry.countries}
+ALPHA2_FROM_ALPHA3 = {alpha3: alpha2 for alpha2, alpha3 in ALPHA3_FROM_ALPHA2.items()}
+
+
+def convert_iso2_to_iso3(df: pd.DataFrame, iso2_col: str = "country_code") -> pd.DataFrame:
+    """Return df with a country_code_iso3 column derived from iso2_col.
+
+    One vectorized hash join against the import-time table; codes that miss
+    (including "Unknown") come back as "Unknown".
+    """
+    return df.assign(
+        country_code_iso3=df[iso2_col].map(ALPHA3_FROM_ALPHA2).fillna("Unknown")
+    )
@@ -0,0 +1,12 @@
+import logging
+
+# Configure the root handler once at import; get_logger then stays a plain
+# lookup with no per-call lock acquisition.
+logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.INFO)
+
+# Pre-built default logger for callers that don't need a named one.
+logger = logging.getLogger("etl")
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)